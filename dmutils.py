@@ -6,7 +6,7 @@ __all__ = [
     'DmDescriptor',         'GlobalVars',           'is_root',              
     'win_desktop_path',     'sysc',                 'get_path',             
     'get_all_path',         'resource_path',        'read_treezip',
-    'level_X_path',         'get_runtime_path',     'join_path', 
+    'level_x_path',         'get_runtime_path',     'join_path', 
     'get_current_time',     'teewrap',              'dmlog',
     'timethis',             'CodeTimer',            'mkdir', 
     'dict2json',            'json2dict',            'json2jsone', 
@@ -17,7 +17,8 @@ __all__ = [
     'merge_all_dicts',      'check_your_system',    'traceback_get', 
     'traceback_print',      'exception_get',        'exception_print', 
     'print_aligned',        'safe_remove',          'dedent',
-    'check_return_code',
+    'check_return_code',    'copy_resource',        'PathRecord',
+    'PathBlob',
 ]
 
 
@@ -30,21 +31,36 @@ class DmDescriptor:
     ####################
 
     def __init__(self, func):
+        ###### import ######
+        inspect = _dmimport(import_module='inspect')
+        ####################
+
         self.func = func
+        # decided once here, a TypeError raised inside func is not mistaken for a missing self anymore
+        try:
+            self._needs_args = any(
+                param.default is param.empty and param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+                for param in inspect.signature(func).parameters.values()
+            )
+        except (TypeError, ValueError):
+            # no signature available, just try the call
+            self._needs_args = False
 
     def __get__(self, instance, owner):
         if instance is None:
             # call from class
-            try:
-                return self.func()
-            except TypeError:
+            if self._needs_args:
                 print(f"Warning! Make sure to use class level to call [{self.func.__name__}]")
                 return
+            return self.func()
         else:
             # call from instance
             return self.func(instance)
 
 
+_DMIMPORT_CACHE = {}
+
+
 def _dmimport(*, from_module=None, import_module):
     """
     Import a module or specific attributes from a module.
@@ -60,33 +76,61 @@ def _dmimport(*, from_module=None, import_module):
             If a module or attribute cannot be imported, None is returned in its place. 
             If an error occurs during import, the first element of the list will be a string describing the error, 
             and the second element will be the exception object.
+
+    Results are cached per (from_module, import_module), so the function level
+    import blocks only pay the import cost once per process.
     """
     ###### import ######
     # common
     ####################
 
+    key = (from_module, import_module)
+    try:
+        return _DMIMPORT_CACHE[key]
+    except KeyError:
+        pass
+
+    # only a cache miss decides between one name and a comma separated list
     try:
-        if from_module:
-            module = __import__(from_module, fromlist=[import_module])
-            if ',' in import_module:
-                attrs = import_module.split(',')
-                return [getattr(module, attr.strip()) for attr in attrs]
-            else:
-                return getattr(module, import_module)
-        else:
-            if ',' in import_module:
-                modules = import_module.split(',')
-                return [__import__(module.strip()) for module in modules]
-            else:
-                return __import__(import_module)
-    except ModuleNotFoundError:
         if ',' in import_module:
-            return [None for _ in import_module.split(',')]
+            result = _dmimport_many(from_module, [name.strip() for name in import_module.split(',')])
         else:
-            return []
+            result = _dmimport_one(from_module, import_module)
     except Exception as e:
         return [f"from_module={from_module}::import_module={import_module} error", e]
 
+    _DMIMPORT_CACHE[key] = result
+    return result
+
+
+def _dmimport_one(from_module, import_module):
+    """uncached single name import of _dmimport, [] when the module is missing"""
+    ###### import ######
+    # common
+    ####################
+
+    try:
+        if from_module:
+            return getattr(__import__(from_module, fromlist=[import_module]), import_module)
+        return __import__(import_module)
+    except ModuleNotFoundError:
+        return []
+
+
+def _dmimport_many(from_module, names):
+    """uncached comma separated import of _dmimport, a list with None for the missing modules"""
+    ###### import ######
+    # common
+    ####################
+
+    try:
+        if from_module:
+            module = __import__(from_module, fromlist=names)
+            return [getattr(module, name) for name in names]
+        return [__import__(name) for name in names]
+    except ModuleNotFoundError:
+        return [None for _ in names]
+
 
 class GlobalVars:
     def __init__(self):
@@ -104,15 +148,33 @@ class GlobalVars:
         REGIONAL_URLS
         BATHEADER
         NUITKA_HELP
+
+        the modules behind the properties are imported on first use, see _LAZY,
+        the constant ones (SYSTEM, URLS, REGIONAL_URLS, BATHEADER, NUITKA_HELP) are built once per instance
         """
         ###### import ######
-        self.os         = _dmimport(import_module='os')
-        self.time       = _dmimport(import_module='time')
-        self.dt         = _dmimport(from_module='datetime', import_module='datetime')
-        self.platform   = _dmimport(import_module='platform')
-        self.textwrap   = _dmimport(import_module='textwrap')
+        # common
         ####################
 
+    # attribute: (from_module, import_module), resolved by __getattr__ and kept on the instance
+    _LAZY = {
+        'os'        : (None, 'os'),
+        'time'      : (None, 'time'),
+        'dt'        : ('datetime', 'datetime'),
+        'date'      : ('datetime', 'date'),
+        'platform'  : (None, 'platform'),
+        'textwrap'  : (None, 'textwrap'),
+    }
+
+    def __getattr__(self, name):
+        # only called when the normal lookup fails, so once per module and instance
+        try:
+            from_module, import_module = self._LAZY[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        value = self.__dict__[name] = _dmimport(from_module=from_module, import_module=import_module)
+        return value
+
     @property
     def SEP(self):
         return self.os.sep
@@ -123,7 +185,7 @@ class GlobalVars:
     
     @property
     def CURRENTDATE(self):
-        return self.CURRENTTIME.split(" ")[0]
+        return self.time.strftime("%Y-%m-%d", self.time.localtime())
 
     @property
     def CURRENTWORKDIR(self):
@@ -131,17 +193,18 @@ class GlobalVars:
     
     @property
     def CURRENTYEAR(self):
-        return int(self.dt.now().isocalendar()[0])
+        return self.date.today().isocalendar().year
     
     @property
     def CURRENTWEEK(self):
-        return int(self.dt.now().isocalendar()[1])
+        return self.date.today().isocalendar().week
     
-    @property
+    @_dmimport(from_module='functools', import_module='cached_property')
     def SYSTEM(self):
+        # the os does not change while running
         return self.platform.system()
 
-    @property
+    @_dmimport(from_module='functools', import_module='cached_property')
     def URLS(self):
         return {
             'Pytorch'            : 'https://pytorch.org/',
@@ -151,7 +214,7 @@ class GlobalVars:
             'Conda'              : 'https://repo.continuum.io/pkgs/free/',
         }
 
-    @property
+    @_dmimport(from_module='functools', import_module='cached_property')
     def REGIONAL_URLS(self):
         return {
             'cn': {
@@ -160,7 +223,7 @@ class GlobalVars:
             }
         }
 
-    @property
+    @_dmimport(from_module='functools', import_module='cached_property')
     def BATHEADER(self):
         """
         Auto switch stdout to python console in windows BAT file
@@ -198,7 +261,7 @@ class GlobalVars:
         # Then the last caret simply append the next line to the label line, so batch doesn't see the ''' line.
     """)
 
-    @property
+    @_dmimport(from_module='functools', import_module='cached_property')
     def NUITKA_HELP(self):
         """
         Nuitka user guide record
@@ -758,6 +821,16 @@ class GlobalVars:
                                 before compilation. Mostly intended for developing
                                 plugins. Default False.
         """)
+
+
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
+def _gv():
+    """shared GlobalVars instance for module internals, the properties are still computed on access"""
+    ###### import ######
+    # common
+    ####################
+
+    return GlobalVars()
     
 
 def is_root():
@@ -769,21 +842,48 @@ def is_root():
     return os.geteuid() == 0
 
 
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
 def win_desktop_path():
-    """return your desktop path"""
+    """return your desktop path, the registry is only read on the first call"""
     ###### import ######
     winreg = _dmimport(import_module='winreg')
     ####################
 
-    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders')
-    return winreg.QueryValueEx(key, "Desktop")[0]
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders') as key:
+        return winreg.QueryValueEx(key, "Desktop")[0]
+
+
+def _iter_lines(fd, chunk=65536):
+    """
+    read a pipe fd until EOF, yield the decoded lines of each chunk as a list
+
+    lines are split on \\n, \\r and \\r\\n like a text mode pipe,
+    the incremental decoder keeps utf-8 sequences split between chunks
+    """
+    ###### import ######
+    os     = _dmimport(import_module='os')
+    codecs = _dmimport(import_module='codecs')
+    ####################
+
+    decode = codecs.getincrementaldecoder('utf-8')('replace').decode
+    buf = ''
+    while data := os.read(fd, chunk):
+        text = buf + decode(data)
+        # a trailing '\r' may be the first half of '\r\n', keep it for the next chunk
+        cut = len(text) - 1 if text.endswith('\r') else len(text)
+        lines = text[:cut].replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        buf = lines.pop() + text[cut:]
+        yield lines
+    if buf := buf + decode(b'', final=True):
+        yield [buf]
 
 
 def sysc(command: str, cwd=None, outprint=True, printfunction=print):
     """
     Combine win_command and bash_command into one unify function
-    - use p.stdout to get output instead of p.communicate to have a real time output
-    - use p.poll() to check if the process is still running or not
+    - read p.stdout in 64KB chunks with os.read to have a real time output
+    - blocking read until EOF, then p.wait() for the return code, no polling
+    - simple commands without shell syntax run directly without /bin/sh on posix
     - return output -> list and return code
 
     command : str, your running command in system
@@ -793,29 +893,44 @@ def sysc(command: str, cwd=None, outprint=True, printfunction=print):
     """
     ###### import ######
     subprocess = _dmimport(import_module='subprocess')
+    sys        = _dmimport(import_module='sys')
+    shlex      = _dmimport(import_module='shlex')
+    shutil     = _dmimport(import_module='shutil')
     ####################
 
+    # skip the extra /bin/sh process when the command uses no shell feature,
+    # builtins (cd, exit, ...) and relative executables still go through the shell
+    args, shell = command, True
+    if not sys.platform.startswith('win') and not any(c in command for c in ';|&<>$`*?()[]{}\\"\'~#!\n'):
+        argv = shlex.split(command)
+        if argv and '/' not in argv[0] and shutil.which(argv[0]):
+            args, shell = argv, False
+
     p = subprocess.Popen(
-        command,
-        shell=True,
+        args,
+        shell=shell,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        encoding='utf-8',
+        bufsize=0,
         cwd=cwd
     )
     OUT = []
-    while (line := p.stdout.readline()) != '' or (RC := p.poll()) is None:
-        # if line:
-        #     if outprint:
-        #         printfunction(line.strip())
-        #     OUT.append(line.strip())
-
-        # add \r to overwrite the line for the case taht executing apt-get commands
-        if line:
-            stripped_line = line.strip()
-            if outprint:
-                printfunction('\r' + stripped_line if printfunction == print else stripped_line)
-            OUT.append(stripped_line)
+    # the builtin print gets the lines of a whole chunk in one call
+    batch_print = printfunction is print
+
+    for lines in _iter_lines(p.stdout.fileno()):
+        stripped_lines = list(map(str.strip, lines))
+        OUT.extend(stripped_lines)
+        if not outprint or not stripped_lines:
+            continue
+        if batch_print:
+            # add \r to overwrite the line for the case taht executing apt-get commands
+            print('\r' + '\n\r'.join(stripped_lines))
+        else:
+            for stripped_line in stripped_lines:
+                printfunction(stripped_line)
+    p.stdout.close()
+    RC = p.wait()
 
     return OUT, RC
 
@@ -826,6 +941,9 @@ def dedent(text: str):
     textwrap = _dmimport(import_module='textwrap')
     ####################
 
+    # nothing to scan for an empty text, e.g. an unset description
+    if not text:
+        return text
     return textwrap.dedent(text)
 
 
@@ -835,12 +953,10 @@ def check_return_code(rc: int, process: str, fprint=print, exit_on_fail=True):
     sys = _dmimport(import_module='sys')
     ####################
 
-    if rc != 0:
-        fprint(f"Execute [{process}] fail, exit.")
-        if exit_on_fail:
-            sys.exit(1)
-    else:
-        fprint(f"Execute [{process}] success.")
+    failed = rc != 0
+    fprint(f"Execute [{process}] {('success', 'fail, exit')[failed]}.")
+    if failed and exit_on_fail:
+        sys.exit(1)
 
 
 def win_command(command):
@@ -852,9 +968,8 @@ def win_command(command):
     subprocess = _dmimport(import_module='subprocess')
     ####################
 
-    sub = subprocess.Popen(f"{command}", stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
-    out, err = sub.communicate()
-    return out, err
+    result = subprocess.run(f"{command}", capture_output=True, encoding='utf-8')
+    return result.stdout, result.stderr
 
 
 def bash_command(command):
@@ -867,74 +982,139 @@ def bash_command(command):
     ####################
 
     response = []
-    p = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    for line in iter(p.stdout.readline, b''):
-        line = line.decode().strip()
-        if line:
-            response.append(line)
-            print(line)
+    with subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='utf-8') as p:
+        for line in p.stdout:
+            line = line.strip()
+            if line:
+                response.append(line)
+                print(line)
     return response
 
 
-def get_path(path):
-    """generate all abs path under the given path, return a generator"""
+def get_path(path, match=None):
+    """
+    generate all abs path under the given path, return a generator
+
+    match: func, optional predicate called with the file name, only matched files are yielded
+
+    >>> get_path(path, match=lambda name: name.endswith('.py'))
+    """
     ###### import ######
     os = _dmimport(import_module='os')
     ####################
 
-    for dirname, _, filenames in os.walk(path):
-        for filename in filenames:
-            yield os.path.join(dirname, filename)
+    # same results as os.walk: missing or unreadable directories are skipped,
+    # links to directories are listed as directories but not followed
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        dirs = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    # every other entry is a file for os.walk: broken links, fifos, sockets...
+                    if match is None or match(entry.name):
+                        yield entry.path
+                elif not entry.is_symlink():
+                    dirs.append(entry.path)
+        # depth first in directory order, like os.walk
+        stack.extend(reversed(dirs))
 
 
 def get_all_path(rootdir):
-    """return all files abs paths in the given directory, return a list"""
+    """
+    return all files abs paths in the given directory, return a list
+
+    links to files and directories are followed, only (links to) regular files are listed,
+    a missing or unreadable directory raises
+    """
     ###### import ######
     os = _dmimport(import_module='os')
     ####################
 
     path_list = []
-    all_list = os.listdir(rootdir)
-    for i in range(len(all_list)):
-        com_path = os.path.join(rootdir, all_list[i])
-        if os.path.isfile(com_path):
-            path_list.append(com_path)
-        if os.path.isdir(com_path):
-            path_list.extend(get_all_path(com_path))
+    # one open scandir per level, the files come in the same order as a recursive listdir walk
+    stack = [os.scandir(rootdir)]
+    try:
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop().close()
+            elif entry.is_file():
+                path_list.append(entry.path)
+            elif entry.is_dir():
+                stack.append(os.scandir(entry.path))
+    finally:
+        for it in stack:
+            it.close()
     return path_list
 
 
-def resource_path(filepath):
-    """return absolute path if your file is under executable"""
+def _get_app_base():
+    """return the executable directory if frozen, otherwise this module's directory"""
     ###### import ######
     sys = _dmimport(import_module='sys')
     os  = _dmimport(import_module='os')
     ####################
 
     if getattr(sys, 'frozen', False):
-        application_path = os.path.dirname(sys.executable)
-    elif __file__:
-        application_path = os.path.dirname(__file__)
-    return os.path.join(application_path, filepath)
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(__file__)
+
+
+# sys.frozen can not change during the process lifetime
+_APP_BASE = _get_app_base()
+
+
+def resource_path(filepath):
+    """return absolute path if your file is under executable"""
+    ###### import ######
+    os  = _dmimport(import_module='os')
+    ####################
+
+    return os.path.join(_APP_BASE, filepath)
+
+
+def copy_resource(filepath, dest):
+    """
+    copy a file bundled under the executable to dest, return dest
+
+    recommended way to extract data files from a frozen app,
+    shutil.copyfile uses sendfile/CopyFileEx so the data does not go through python
+
+    >>> copy_resource('config/default.json', './default.json')
+    """
+    ###### import ######
+    shutil = _dmimport(import_module='shutil')
+    ####################
+
+    return shutil.copyfile(resource_path(filepath), dest)
 
 
 def level_x_path(path, level=3):
     """return the level of the path under the given path"""
     ###### import ######
-    os  = _dmimport(import_module='os')
+    os    = _dmimport(import_module='os')
+    deque = _dmimport(from_module='collections', import_module='deque')
     ####################
 
     path_list = []
-    all_list = os.listdir(path)
-    for i in range(len(all_list)):
-        try:
-            com_path = os.path.join(path, all_list[i])
-        except NotADirectoryError:
-            continue
-        if level == 1:
-            path_list.append(com_path)
-        else:
-            path_list.extend(level_x_path(com_path, level=level-1))
+    queue = deque([(path, level)])
+    while queue:
+        top, depth = queue.popleft()
+        with os.scandir(top) as it:
+            for entry in it:
+                if depth == 1:
+                    path_list.append(entry.path)
+                elif entry.is_dir():
+                    queue.append((entry.path, depth - 1))
     return path_list
 
 
@@ -965,20 +1145,41 @@ def get_current_time(format="%Y-%m-%d %H:%M:%S"):
     time  = _dmimport(import_module='time')
     ####################
 
-    return time.strftime(format, time.localtime())
+    # strftime reads the local time in C, passing time.localtime() only builds a throwaway struct_time
+    return time.strftime(format)
 
 class Tee:
-    def __init__(self, *files):
+    """
+    write to several files at once
+
+    files    : every file is written and flushed on every flush() call, like the files themselves
+    buffered : files that are written too but only flushed by flush_all() or on close,
+               for a log file that should be written in big blocks (keyword only, optional)
+    """
+    __slots__ = ('files', '_flushed')
+
+    def __init__(self, *files, buffered=()):
         ###### import ######
         # common
         ####################
-        self.files = files
+        self.files = files + tuple(buffered)
+        self._flushed = files
 
     def write(self, obj):
         for file in self.files:
             file.write(obj)
 
+    def writelines(self, lines):
+        # materialize once, every sink gets the same list in one call
+        lines = list(lines)
+        for file in self.files:
+            file.writelines(lines)
+
     def flush(self):
+        for file in self._flushed:
+            file.flush()
+
+    def flush_all(self):
         for file in self.files:
             file.flush()
 
@@ -990,30 +1191,43 @@ def teewrap(run_time_log):
     logging    = _dmimport(import_module='logging')
     ####################
 
+    # built once per decorated function, idle handlers are reused by the next call,
+    # nested or concurrent calls pop their own handler from the pool
+    formatter = logging.Formatter('%(asctime)s [%(levelname)s]%(message)s')
+    handler_pool = []
+
     def decorator_log_to_file(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            f = open(run_time_log, 'w')
-            tee = Tee(sys.stdout, f)
+            # 64KB buffer, Tee.flush leaves the log file alone so it is written in big blocks,
+            # stdout is still flushed on every flush() (print(flush=True), log records)
+            f = open(run_time_log, 'w', buffering=65536)
+            tee = Tee(sys.stdout, buffered=(f,))
             stdout_original = sys.stdout 
 
             # Redirect stdout to tee(stdout and file)
             sys.stdout = tee
 
-            # Create a new logger and configure it
+            # Point a pooled handler to the tee and attach it to the root logger
             logger = logging.getLogger()
             logger.setLevel(logging.DEBUG)
-            handler = logging.StreamHandler(tee)
-            formatter = logging.Formatter('%(asctime)s [%(levelname)s]%(message)s')
-            handler.setFormatter(formatter)
+            try:
+                handler = handler_pool.pop()
+            except IndexError:
+                handler = logging.StreamHandler()
+                handler.setFormatter(formatter)
+            handler.setStream(tee)
             logger.addHandler(handler)
             
             try:
                 result = func(*args, **kwargs)
             finally:
-                # Restore stdout and remove the handler
+                # Restore stdout, detach the handler and give it back to the pool
                 sys.stdout = stdout_original
                 logger.removeHandler(handler)
+                handler.setStream(stdout_original)
+                handler_pool.append(handler)
+                tee.flush_all()
                 f.close()
             return result
         return wrapper
@@ -1023,26 +1237,51 @@ def teewrap(run_time_log):
 def __logorder__(func):
     """build in wrapper for mylogging, user do not use"""
     ###### import ######
-    logging    = _dmimport(import_module='logging')
+    # common
     ####################
 
+    method_name = func.__name__
+
     def wrapper(self, msg):
-        if self.showlog:
-            if not self.savelog:
-                if self.branch:
-                    getattr(logging, func.__name__)(msg=f"[{self.branch}] - {msg}")
-                else:
-                    getattr(logging, func.__name__)(msg=f"{msg}")
-            else:
-                if self.branch:
-                    getattr(self.logger, func.__name__)(msg=f"[{self.branch}] - {msg}")
-                else:
-                    getattr(self.logger, func.__name__)(msg=f"{msg}")
-        else:
-            ...
+        if not self.showlog:
+            return func(self, msg)
+        prefix = self._branch_prefix
+        self._log_fn[method_name](f"{prefix}{msg}" if prefix else msg)
         return func(self, msg)
     return wrapper
 
+class _DmlogDispatch:
+    """the only handler of the shared dmlog listener, hands each record to the handlers of its dmlog"""
+    __slots__ = ()
+
+    @staticmethod
+    def handle(record):
+        closing = record.__dict__.get('dmlog_close')
+        if closing is not None:
+            # queued by dmlog.close(), the records of that log queued before it are written already
+            for handler in closing:
+                handler.close()
+            return
+        for handler in record.dmlog_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
+def _dmlog_listener():
+    """start the one listener thread shared by every dmlog, stopped at interpreter exit once the queue is written"""
+    ###### import ######
+    queue         = _dmimport(import_module='queue')
+    atexit        = _dmimport(import_module='atexit')
+    QueueListener = _dmimport(from_module='logging.handlers', import_module='QueueListener')
+    ####################
+
+    listener = QueueListener(queue.Queue(-1), _DmlogDispatch())
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 class dmlog():
     """
     A simpl logging system
@@ -1057,12 +1296,20 @@ class dmlog():
     llevel : str, the shown log level in logging
     showlog: bool, the switch to enable log or not
     savelog: str/None, save log to a cerain directory
+
+    the records always go to the root logger handlers too (logging.basicConfig, teewrap, your own handlers),
+    without savelog the console output comes from basicConfig like a plain logging.info call.
+    with savelog, the file and console handlers of this log only get its own records, through a queue:
+    one background listener thread shared by all the dmlog instances writes them,
+    close() hands the handlers back to that thread to be closed after the queued records (also done on delete).
+    the records are filtered by llevel only, the root logger level does not drop them
     """
 
     def __init__(self, branch=None, llevel='debug', showlog=True, savelog=None, format='%(asctime)s [%(levelname)s]%(message)s'):
         ###### import ######
         self.logging  = _dmimport(import_module='logging')
         self.os       = _dmimport(import_module='os')
+        QueueHandler  = _dmimport(from_module='logging.handlers', import_module='QueueHandler')
         ####################
 
         self.level_relation = {
@@ -1076,22 +1323,70 @@ class dmlog():
         self.savelog = savelog
         self.format = format
 
+        handlers = []
         if not savelog:
             self.logging.basicConfig(level=self.level_relation[llevel], format=self.format)
         else:
             if self.os.path.exists(savelog):
                 self.os.remove(savelog)
-            fh = self.logging.FileHandler(savelog)
-            sh = self.logging.StreamHandler()
             ft = self.logging.Formatter(self.format)
-            fh.setLevel(self.level_relation[llevel])
-            sh.setLevel(self.level_relation[llevel])
-            fh.setFormatter(ft)
-            sh.setFormatter(ft)
-            self.logger = self.logging.getLogger()
-            self.logger.setLevel(self.level_relation[llevel])
-            self.logger.addHandler(fh)
-            self.logger.addHandler(sh)
+            handlers.append(self.logging.FileHandler(savelog))
+            handlers.append(self.logging.StreamHandler())
+            for handler in handlers:
+                handler.setLevel(self.level_relation[llevel])
+                handler.setFormatter(ft)
+        self._handlers = handlers = tuple(handlers)
+
+        def route(record):
+            # the shared listener finds the handlers of this log on the record
+            record.dmlog_handlers = handlers
+            return True
+
+        # not registered in the logging manager, nothing keeps the logger once the instance is gone,
+        # hooked under the root logger by hand so the records still propagate to the root handlers
+        self.logger = self.logging.Logger(f"dmlog.{id(self)}", self.level_relation[llevel])
+        self.logger.parent = self.logging.root
+        if showlog and handlers:
+            # the listener thread is only started by the first log that has handlers of its own
+            self._listener = _dmlog_listener()
+            queue_handler = QueueHandler(self._listener.queue)
+            queue_handler.addFilter(route)
+            self.logger.addHandler(queue_handler)
+        else:
+            self._listener = None
+
+        # bound once here, the log calls only do a dict lookup
+        self._branch_prefix = f"[{branch}] - " if branch else ""
+        self._log_fn = {
+            'info'     : self.logger.info,
+            'debug'    : self.logger.debug,
+            'warning'  : self.logger.warning,
+            'error'    : self.logger.error,
+            'exception': self.logger.exception
+        }
+
+    def close(self):
+        """stop logging and release the handlers once their queued records are written, does not block"""
+        if self._handlers is None:
+            return
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+        self.logger.disabled = True
+        if self._listener is not None:
+            # queued behind the records of this log, the listener thread closes the handlers
+            self._listener.queue.put_nowait(self.logging.makeLogRecord({'dmlog_close': self._handlers}))
+        else:
+            for handler in self._handlers:
+                handler.close()
+        self._handlers = None
+        self._listener = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            # half built instance or interpreter shutdown
+            pass
 
     @__logorder__
     def info(self, msg):
@@ -1123,14 +1418,14 @@ def timethis(func):
     ...    ...
     """
     ###### import ######
-    time = _dmimport(import_module='time')
+    perf_counter_ns = _dmimport(from_module='time', import_module='perf_counter_ns')
     ####################
 
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = perf_counter_ns()
         result = func(*args, **kwargs)
-        end = round((time.time() - start), 3)
-        print(f'{func.__name__} running time: {end}sec.')
+        end = perf_counter_ns() - start
+        print(f'{func.__name__} running time: {end / 1e9:.3f}sec.')
         return result
     return wrapper
 
@@ -1145,19 +1440,24 @@ class CodeTimer(object):
 
     def __init__(self, keep_num=3):
         ###### import ######
-        self.time = _dmimport(import_module='time')
+        self._time    = _dmimport(from_module='time', import_module='time')
+        self._perf_ns = _dmimport(from_module='time', import_module='perf_counter_ns')
         ####################
 
-        self.start = self.time.time()
+        # start/stop are wall clock (epoch) times, cost comes from the monotonic counter
+        self.start = self._time()
+        self._t0 = self._perf_ns()
         self.keep_num = keep_num
 
     def __enter__(self):
         return self
 
     def __exit__(self, *_):
-        self.stop = self.time.time()
-        self.cost = self.stop - self.start
-        print(f'Running time: {round(self.cost, self.keep_num)}sec')
+        # integer nanoseconds, the format spec does the rounding for display only
+        elapsed_ns = self._perf_ns() - self._t0
+        self.stop = self._time()
+        self.cost = elapsed_ns / 1e9
+        print(f'Running time: {self.cost:.{self.keep_num}f}sec')
 
 
 def mkdir(path):
@@ -1167,8 +1467,14 @@ def mkdir(path):
     ####################
 
     path = path.strip().rstrip("\\")
-    if not os.path.exists(path):
-        os.makedirs(path)
+    # optimistic single mkdir for the common case of an existing parent
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        if not os.path.isdir(path):
+            raise
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
 
 
 def safe_remove(file_path):
@@ -1177,13 +1483,14 @@ def safe_remove(file_path):
     before you use this function, make sure you really want to remove the file
     """
     ###### import ######
-    PurePath = _dmimport(from_module="pathlib", import_module='PurePath')
-    Path = _dmimport(from_module="pathlib", import_module='Path')
+    os = _dmimport(import_module='os')
     ####################
 
-    if not isinstance(file_path, Path):
-        file_path = Path(PurePath(file_path))
-    file_path.unlink(missing_ok=True)
+    # os.fspath accepts both str and Path, no pathlib objects needed for one unlink
+    try:
+        os.unlink(os.fspath(file_path))
+    except FileNotFoundError:
+        pass
 
 
 def dict2json(target_dict, json_name, json_path) -> None:
@@ -1195,95 +1502,213 @@ def dict2json(target_dict, json_name, json_path) -> None:
     json_path  : str, the path to the json file 
     """
     ###### import ######
-    os   = _dmimport(import_module='os')
     json = _dmimport(import_module='json')
     ####################
 
     file = join_path(json_path, f'{json_name}.json')
-    if not os.path.exists(json_path):
-        mkdir(json_path)
-    content = json.dumps(target_dict, indent=4)
-    with open(file, 'w') as json_file:
+    mkdir(json_path)
+    # always the stdlib json, orjson can only indent by 2
+    content = json.dumps(target_dict, indent=4).encode()
+    with open(file, 'wb', buffering=65536) as json_file:
         json_file.write(content)
 
 
-def json2dict(json_path) -> dict:
-    """"json to dict"""
+def _read_bytes(file_path) -> bytes:
+    """read a whole file as bytes with raw os calls, one read for regular files"""
     ###### import ######
-    json = _dmimport(import_module='json')
+    os = _dmimport(import_module='os')
     ####################
 
-    with open(json_path, 'r', encoding='UTF-8') as f:
-        return json.load(f)
-    
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        content = os.read(fd, size) if size else b''
+        if len(content) < size or not size:
+            # short read or size not reported (pipes, procfs), read until EOF
+            chunks = [content]
+            while chunk := os.read(fd, 65536):
+                chunks.append(chunk)
+            content = b''.join(chunks)
+    finally:
+        os.close(fd)
+    return content
+
+
+def _json_native(obj) -> bool:
+    """
+    check that obj only holds what the stdlib json writes natively and orjson writes the same way:
+    dict/list/tuple/str/int/bool/None and finite floats (orjson writes NaN/Infinity as null),
+    dict keys str/int/bool/None (a float key 1e16 is "1e16" for orjson but "1e+16" for the stdlib),
+    anything else (date, UUID, subclasses...) is refused since the stdlib json raises or writes it its own way
+    """
+    ###### import ######
+    isfinite = _dmimport(from_module='math', import_module='isfinite')
+    ####################
+
+    key_types = (str, int, bool, type(None))
+    stack = [obj]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is float:
+            if not isfinite(item):
+                return False
+        elif kind is dict or kind is list or kind is tuple:
+            # a circular dict is left to the dumpers, they raise on it
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            if kind is dict:
+                if not all(type(key) in key_types for key in item):
+                    return False
+                stack.extend(item.values())
+            else:
+                stack.extend(item)
+        elif kind not in key_types:
+            return False
+    return True
+
+
+def _json_dumps(target_dict, fast=False) -> bytes:
+    """
+    dump to compact json bytes with the stdlib json
 
-def json2jsone(json_path: str, jsone_path: str):
+    fast: use orjson if it is installed, only for dicts made of plain json types (see _json_native),
+          everything else (NaN/Infinity, float keys, dates...) and what orjson refuses (ints over 64 bits)
+          stays on the stdlib json, the output is compact json without spaces then
+    """
+    ###### import ######
+    json   = _dmimport(import_module='json')
+    orjson = _dmimport(import_module='orjson')
+    ####################
+
+    if fast and orjson and _json_native(target_dict):
+        try:
+            return orjson.dumps(target_dict, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson.JSONEncodeError, ints over 64 bits, unsupported types, too deep nesting
+            pass
+    return json.dumps(target_dict).encode()
+
+
+def _json_loads(content, fast=False):
+    """
+    parse json bytes with the stdlib json
+
+    fast: use orjson if it is installed, only when it reads the same data: orjson turns ints out of
+          the 64 bits range into floats, so any run of 19 digits or more goes to the stdlib json,
+          and so does what orjson refuses (NaN/Infinity, lone surrogates...)
+    """
+    ###### import ######
+    re     = _dmimport(import_module='re')
+    json   = _dmimport(import_module='json')
+    orjson = _dmimport(import_module='orjson')
+    ####################
+
+    if fast and orjson and not re.search(rb'\d{19}', content):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+def json2dict(json_path, *, fast=False) -> dict:
+    """"
+    json to dict
+
+    json_path: str, the json file
+    fast     : bool, parse with orjson if it is installed, the stdlib json is still used
+               for the files orjson would not read the same (big ints, NaN/Infinity)
+    """
+    ###### import ######
+    # common
+    ####################
+
+    # read raw bytes, both parsers decode utf-8 themselves
+    return _json_loads(_read_bytes(json_path), fast=fast)
+
+
+def _new_fernet():
+    """generate a new key, print it and return its Fernet"""
+    ###### import ######
+    Fernet = _dmimport(from_module='cryptography.fernet', import_module='Fernet')
+    ####################
+
+    KEY = Fernet.generate_key()
+    print(f"Decrypt key: {KEY}")
+    return Fernet(KEY)
+
+
+def json2jsone(json_path: str, jsone_path: str, *, fernet=None, fast=False):
     """ 
     Encrypt json file 
     please make sure to send full jsone path(including name) for parameter 
 
     json_path : str, the json file you want to encrypt
     jsone_path: str, the jsone file you want to save
+    fernet    : Fernet, reuse this instance instead of generating a new key (optional)
+    fast      : bool, parse and dump with orjson if it is installed (optional),
+                the stdlib json is still used for what orjson would not keep the same
     """
     ###### import ######
-    Fernet = _dmimport(from_module='cryptography.fernet', import_module='Fernet')
-    json   = _dmimport(import_module='json')
+    # common
     ####################
 
-    KEY = Fernet.generate_key()
-    FERNET = Fernet(KEY)
-    with open(json_path, encoding='UTF-8') as f:
-        dict_original = json.load(f)
-    dict_original = json.dumps(dict_original).encode()
-    dict_encrypted = FERNET.encrypt(dict_original)
+    FERNET = fernet if fernet is not None else _new_fernet()
+    dict_encrypted = FERNET.encrypt(_json_dumps(json2dict(json_path, fast=fast), fast=fast))
 
     with open(jsone_path, "wb") as f:
         f.write(dict_encrypted)
 
     print(f"Encrypted json to: {jsone_path}")
-    print(f"Decrypt key: {KEY}")
 
 
-def dict2jsone(target_dict, jsone_name, jsone_path):
+def dict2jsone(target_dict, jsone_name, jsone_path, *, fernet=None, fast=False):
     """
     Ecrypt dict to jsone encrypted file
 
     target_dict: dict
     jsone_name : str, the name of the jsone file
     jsone_path : str, the generated path of the jsone file
+    fernet     : Fernet, reuse this instance instead of generating a new key (optional),
+                 handy when encrypting a lot of dicts with the same key
+    fast       : bool, dump with orjson if it is installed (optional),
+                 the stdlib json is still used for NaN/Infinity and ints over 64 bits
     """
     ###### import ######
-    Fernet = _dmimport(from_module='cryptography.fernet', import_module='Fernet')
-    json   = _dmimport(import_module='json')
+    # common
     ####################
 
-    KEY = Fernet.generate_key()
-    FERNET = Fernet(KEY)
+    FERNET = fernet if fernet is not None else _new_fernet()
     jsone_file_path = join_path(jsone_path, f'{jsone_name}.jsone')
-    dict_original = json.dumps(target_dict).encode()
-    dict_encrypted = FERNET.encrypt(dict_original)
+    dict_encrypted = FERNET.encrypt(_json_dumps(target_dict, fast=fast))
 
     with open(jsone_file_path, "wb") as f:
         f.write(dict_encrypted)
 
     print(f"Encrypted dict to: {jsone_file_path}")
-    print(f"Decrypt key: {KEY}")
 
 
-def openjsone(jsone_path, key) -> dict:
+def openjsone(jsone_path, key=None, *, fernet=None, fast=False) -> dict:
     """ 
     Open encrypted json file 
 
     jsone_path: str, jsone file path
     key       : byte string, Fernet key for this jsone file  
+    fernet    : Fernet, use this instance instead of the key (optional),
+                build it once with Fernet(key) and pass it when opening a lot of files with the same key,
+                the key itself is not kept anywhere after the call
+    fast      : bool, parse with orjson if it is installed (optional),
+                the stdlib json is still used for big ints and NaN/Infinity
     """
     ###### import ######
     Fernet = _dmimport(from_module='cryptography.fernet', import_module='Fernet')
-    json   = _dmimport(import_module='json')
     ####################
 
-    with open(jsone_path, "rb") as f:
-        return json.loads(Fernet(key).decrypt(f.read()).decode('utf-8'))
+    FERNET = fernet if fernet is not None else Fernet(key)
+    return _json_loads(FERNET.decrypt(_read_bytes(jsone_path)), fast=fast)
 
 class ZipReader(object):
     """
@@ -1302,13 +1727,14 @@ class ZipReader(object):
     def __init__(self, zippath, filekeyword):
         ###### import ######
         self.zipfile =  _dmimport(import_module="zipfile")
+        self.StringIO = _dmimport(from_module='io', import_module='StringIO')
         ####################
 
         with self.zipfile.ZipFile(zippath, "r") as z:
-            for zipfile_path in z.namelist():
-                if filekeyword in zipfile_path:
-                    with z.open(zipfile_path, 'r') as file:
-                        self.content = list(map(lambda x: x.decode(), file.readlines()))
+            matched = [i for i in z.namelist() if filekeyword in i]
+            if matched:
+                # the last matched file wins, decode it in one go and split on '\n' only like readlines()
+                self.content = self.StringIO(z.read(matched[-1]).decode(), newline='\n').readlines()
 
     def __enter__(self):
         return self.content
@@ -1334,15 +1760,18 @@ class Zip2Reader(object):
         ###### import ######
         self.zipfile =  _dmimport(import_module="zipfile")
         self.BytesIO = _dmimport(from_module='io', import_module='BytesIO')
+        self.StringIO = _dmimport(from_module='io', import_module='StringIO')
         ####################
 
         with self.zipfile.ZipFile(zippath, "r") as mainzip:
-            for mainzipcontent in [i for i in mainzip.namelist() if f".{subziptype}" in i]:
+            # the last matched file wins, search from the end and stop at the first hit
+            for mainzipcontent in reversed([i for i in mainzip.namelist() if f".{subziptype}" in i]):
                 subzip = self.BytesIO(mainzip.read(mainzipcontent))
                 with self.zipfile.ZipFile(subzip, "r") as sz:
-                    for subzipcontent in [i for i in sz.namelist() if filekeyword in i]:
-                            with sz.open(subzipcontent, 'r') as target:
-                                self.content = list(map(lambda x: x.decode(), target.readlines()))
+                    matched = [i for i in sz.namelist() if filekeyword in i]
+                    if matched:
+                        self.content = self.StringIO(sz.read(matched[-1]).decode(), newline='\n').readlines()
+                        break
     def __enter__(self):
         return self.content
 
@@ -1362,13 +1791,13 @@ class DateTransformer():
     >>> DTF.week
     30
     >>> DTF.quarter
-    2
-    >>> DTF.yaerweek
+    3
+    >>> DTF.yearweek
     2023W30
     >>> DTF.yearmonth
     2023M07
     >>> DTF.yearquarter
-    2023Q2
+    2023Q3
     >>> DTF.timestamp
     1690387200
     >>> DTF.weekday
@@ -1376,34 +1805,63 @@ class DateTransformer():
     """
     def __init__(self, datestring):
         ###### import ######
-        self.dt         = _dmimport(from_module='datetime', import_module='datetime')
-        self.time       = _dmimport(import_module='time')
+        # common
         ####################
 
-        datestring = datestring.replace('-','')
-        _FormatDateString = self.dt.strptime(datestring,"%Y%m%d")
-        _DateInformation = _FormatDateString.isocalendar()
-        
-        self.to_Tdate    = _FormatDateString.date()  # trnasform string to date type
-        self.year        = int(_DateInformation[0])
-        self.week        = int(_DateInformation[1])
-        self.month       = int(_FormatDateString.month)
-        self.quarter     = int(self.month // 4 + 1)
-        self.weekday     = _FormatDateString.isoweekday()
-        if len(str(self.week)) == 2:
-            self.yearweek  = f"{self.year}W{self.week}"
-        elif len(str(self.week)) == 1:
-            self.yearweek  = f"{self.year}W0{self.week}"
-        if len(str(self.month)) == 2:
-            self.yearmonth = f"{self.year}M{self.month}"
-        elif len(str(self.month)) == 1:
-            self.yearmonth = f"{self.year}M0{self.month}"
-        self.yearquarter = f"{self.year}Q{self.quarter}"
-        self.timestamp     = int(self.time.mktime(self.time.strptime(datestring,"%Y%m%d")))
+        (self.to_Tdate,     # trnasform string to date type
+         self.year,
+         self.week,
+         self.month,
+         self.quarter,
+         self.weekday,
+         self.yearweek,
+         self.yearmonth,
+         self.yearquarter,
+         self.timestamp) = _parse_datestring(datestring)
+
+
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1024)
+def _parse_datestring(datestring):
+    """parse a YYYYMMDD / YYYY-MM-DD string once for DateTransformer, repeated dates hit the cache"""
+    ###### import ######
+    datetime = _dmimport(import_module='datetime')
+    ####################
 
+    s = datestring.replace('-','')
+    if len(s) == 8 and s.isdigit():
+        _FormatDateString = datetime.datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+    else:
+        # dates without zero padding (2023-7-5) and the error messages are left to strptime
+        _FormatDateString = datetime.datetime.strptime(s, "%Y%m%d")
+    year, week, weekday = _FormatDateString.isocalendar()
+    month   = _FormatDateString.month
+    quarter = (month - 1) // 3 + 1
+    return (
+        _FormatDateString.date(),
+        year,
+        week,
+        month,
+        quarter,
+        weekday,
+        f"{year}W{week:02d}",
+        f"{year}M{month:02d}",
+        f"{year}Q{quarter}",
+        int(_FormatDateString.timestamp()),  # naive datetime is local time, same as time.mktime
+    )
 
-@_dmimport(from_module='contextlib', import_module='contextmanager')
-def ignored(exception=Exception, func=lambda:None, **kwargs):
+
+def _NOOP():
+    """default callback for ignored, do nothing"""
+    ...
+
+
+class _Suppress(_dmimport(from_module='contextlib', import_module='suppress'),
+                _dmimport(from_module='contextlib', import_module='ContextDecorator')):
+    """contextlib.suppress usable as a decorator too, like the @contextmanager version of ignored"""
+    ...
+
+
+def ignored(exception=Exception, func=_NOOP, **kwargs):
     """
     >>> with ignored(exception=Exception, func=SomeFunction, **kwargs):
     ...     ... # some codes here
@@ -1414,11 +1872,26 @@ def ignored(exception=Exception, func=lambda:None, **kwargs):
     ...     ... # some code here
     ... except Exception
     ...     SomeFunction(**kwargs)
+
+    without a callback it is just contextlib.suppress, no generator involved,
+    either way it also works as a function decorator (@ignored(ZeroDivisionError))
     """
     ###### import ######
     # common
     ####################
 
+    if func is _NOOP and not kwargs:
+        return _Suppress(exception)
+    return _ignored_with_callback(exception, func, kwargs)
+
+
+@_dmimport(from_module='contextlib', import_module='contextmanager')
+def _ignored_with_callback(exception, func, kwargs):
+    """ignored with a callback on the exception"""
+    ###### import ######
+    # common
+    ####################
+
     try:
         yield
     except exception:
@@ -1445,6 +1918,9 @@ class xlsxDesigner():
         'PeriWinkle' : 'CCCCFF'
     }
 
+    # the styles are built once here and shared by every cell written with this design
+    __slots__ = ('border', 'font', 'fill', 'alignment')
+
     def __init__(self, bgcolor="BlueAngel", hzalign="left", font='Candara Light', fontsize='14', fontbold=False):
         ###### import ######
         Border, Side, colors, Font, PatternFill, Alignment = _dmimport(from_module='openpyxl.styles', import_module='Border, Side, colors, Font, PatternFill, Alignment')
@@ -1475,6 +1951,9 @@ class xlsxMaker():
     save            : save xlsx file
     """
 
+    # narrow characters for auto_fit_width, mapped to None for str.translate
+    narrow_chars = dict.fromkeys(map(ord, 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))
+
     def __init__(self):
         ###### import ######
         self.openpyxl = _dmimport(import_module='openpyxl')
@@ -1486,58 +1965,52 @@ class xlsxMaker():
     def create_sheet(self, sheetname='undefine'):
         return self.wb.create_sheet(sheetname)
 
-    def _get_num_colnum_dict(self):
-        num_str_dict = {}
-        A_Z = [chr(a) for a in range(ord('A'), ord('Z') + 1)]
-        AA_AZ = ['A' + chr(a) for a in range(ord('A'), ord('Z') + 1)]
-        A_AZ = A_Z + AA_AZ
-        for i in A_AZ:
-            num_str_dict[A_AZ.index(i) + 1] = i
-        return num_str_dict
+    def _text_width(self, text):
+        """letters and digits count 1.1, other characters count 2.2"""
+        if text.isascii():
+            # str.translate drops the ascii letters/digits in C, what is left are the wide ones
+            wide = len(text.translate(self.narrow_chars))
+        else:
+            wide = sum(1 for v in text if not (v.isdigit() or v.isalpha()))
+        return 1.1 * len(text) + 1.1 * wide
+
+    def _auto_fit_width_inplace(self, sheet):
+        """adjust the column widths of an in-memory sheet"""
+        ###### import ######
+        get_column_letter = _dmimport(from_module='openpyxl.utils', import_module='get_column_letter')
+        ####################
+
+        for i, column in enumerate(sheet.iter_cols(values_only=True), start=1):
+            width = max(self._text_width(str(value)) for value in column)
+            sheet.column_dimensions[get_column_letter(i)].width = width + 2
 
     def auto_fit_width(self, excel_name:str, sheet_name:str):
         wb = self.openpyxl.load_workbook(excel_name)
-        sheet = wb[sheet_name]
-        max_column = sheet.max_column
-        max_row = sheet.max_row
-        max_column_dict = {}
-        num_str_dict = self._get_num_colnum_dict()
-        for i in range(1, max_column + 1):
-            for j in range(1, max_row + 1):
-                column = 0
-                sheet_value = sheet.cell(row=j, column=i).value
-                sheet_value_list = [k for k in str(sheet_value)]
-                for v in sheet_value_list:
-                    if v.isdigit() == True or v.isalpha() == True:
-                        column += 1.1
-                    else:
-                        column += 2.2
-                try:
-                    if column > max_column_dict[i]:
-                        max_column_dict[i] = column
-                except Exception as e:
-                    max_column_dict[i] = column
-        for key, value in max_column_dict.items():
-            sheet.column_dimensions[num_str_dict[key]].width = value + 2
+        self._auto_fit_width_inplace(wb[sheet_name])
         wb.save(excel_name)
 
-    def wirte2cell(self, sheet, design, row, column, value, fill=False):
-        sheet.cell(row=row, column=column).value       = value
-        sheet.cell(row=row, column=column).border      = design.border
-        sheet.cell(row=row, column=column).font        = design.font
-        sheet.cell(row=row, column=column).alignment   = design.alignment
+    def write2cell(self, sheet, design, row, column, value, fill=False):
+        cell = sheet.cell(row=row, column=column)
+        cell.value       = value
+        cell.border      = design.border
+        cell.font        = design.font
+        cell.alignment   = design.alignment
         if fill:
-            sheet.cell(row=row, column=column).fill   = design.fill
+            cell.fill    = design.fill
+
+    # old misspelled name, kept for compatibility
+    wirte2cell = write2cell
     
     def write2mergecell(self, sheet, design, start_row, end_row, start_column, end_column, value, fill=False):
-        self.wirte2cell(sheet, design, start_row, start_column, value, fill)
+        self.write2cell(sheet, design, start_row, start_column, value, fill)
         sheet.merge_cells(start_row=start_row, start_column=start_column, end_row=end_row, end_column=end_column)
     
     def save(self, xlsxname, xlsxpath, allautowidth=True):
-        self.wb.save(f"{xlsxpath}{GlobalVars().SEP}{xlsxname}.xlsx")
+        # widths are set on the in-memory workbook, the file is written only once
         if allautowidth:
-            for sheet in self.wb.sheetnames:
-                self.auto_fit_width(excel_name=f"{xlsxpath}{GlobalVars().SEP}{xlsxname}.xlsx", sheet_name=sheet)
+            for sheet in self.wb.worksheets:
+                self._auto_fit_width_inplace(sheet)
+        self.wb.save(join_path(xlsxpath, f"{xlsxname}.xlsx"))
 
 
 class NuitkaMake():
@@ -1561,27 +2034,38 @@ class NuitkaMake():
 
     def __init__(self, main):
         ###### import ######
-        self.os = _dmimport(import_module='os')
+        self.sys        = _dmimport(import_module='sys')
+        self.subprocess = _dmimport(import_module='subprocess')
         ####################
 
-        self.GV = GlobalVars()
-        if self.GV.SYSTEM == 'Windows':
-            self.command = 'python -m nuitka'
-        elif self.GV.SYSTEM == 'Linux':
-            self.command = 'python3 -m nuitka'
-        else:
-            raise TypeError('Unsupported system')
+        self.GV = _gv()
+        # argv list, the interpreter running this script builds the app, no shell involved
+        self._argv = [self.sys.executable, '-m', 'nuitka']
         self.main = main
 
+    @property
+    def command(self):
+        """the full build command as one string, only joined when asked for"""
+        return ' '.join([*self._argv, self.main])
+
+    @staticmethod
+    def _unquote_arg(arg):
+        """key="value" -> key=value, the quotes were only there for the shell"""
+        key, eq, value = arg.partition('=')
+        if eq and len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        return f'{key}{eq}{value}'
+
     def ADD_ARG(self, arg):
-        self.command = self.command.replace(f' {self.main}', '')
-        self.command = f'{self.command} --{arg} {self.main}'
-        print(f'Adding arg: --{arg}')
+        arg = self._unquote_arg(arg if arg.startswith('--') else f'--{arg}')
+        self._argv.append(arg)
+        print(f'Adding arg: {arg}')
 
     def MAKE(self):
+        """run the build and return Nuitka's exit code, like os.system did"""
         print("Nuitka building start ...")
         with CodeTimer():
-          self.os.system(self.command)
+          return self.subprocess.run([*self._argv, self.main], check=False).returncode
     
     def HELP(self):
         print(self.GV.NUITKA_HELP)
@@ -1606,12 +2090,62 @@ class Py2BAT():
         self.output_path = output_path
         
     def MAKE(self):
+        ###### import ######
+        # common
+        ####################
+
         with CodeTimer():
-            with open(f'{self.main}','r', encoding="utf8") as script:
-                codes = script.readlines()
-                with open(f"{self.output_path}{GlobalVars().SEP}{self.batname}.bat", 'w', encoding="utf8") as batch:
-                    batch.write(GlobalVars().BATHEADER)
-                    batch.writelines(codes)
+            # bytes all the way, the newlines are translated to the platform ones like text mode did
+            with open(f'{self.main}','rb') as script:
+                codes = script.read()
+            if b'\r' in codes:
+                codes = codes.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            linesep = _batheader_bytes()[1]
+            if linesep != b'\n':
+                codes = codes.replace(b'\n', linesep)
+            with open(join_path(self.output_path, f"{self.batname}.bat"), 'wb') as batch:
+                batch.write(_batheader_bytes()[0])
+                batch.write(codes)
+
+
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
+def _batheader_bytes():
+    """BATHEADER encoded once with the platform newlines, and that newline"""
+    ###### import ######
+    os = _dmimport(import_module='os')
+    ####################
+
+    linesep = os.linesep.encode()
+    return _gv().BATHEADER.encode('utf-8').replace(b'\n', linesep), linesep
+
+
+def _return_save(function, ret, done, *args, **kwargs):
+    """thread target for _progress_bar, keep the return value in ret[0] and set done at exit"""
+    try:
+        ret[0] = function(*args, **kwargs)
+    finally:
+        done.set()
+
+
+class _BarPrinter():
+    """build in bar-print-function handed to the function as _progress_bar"""
+    __slots__ = ('pbar', 'bar_format')
+
+    def __init__(self, pbar, bar_format):
+        ###### import ######
+        # common
+        ####################
+        self.pbar = pbar
+        self.bar_format = bar_format
+
+    def print_with_bar(self, msg):
+        self.pbar.bar_format = self.bar_format + msg
+
+    def print_in_line(self, msg):
+        self.pbar.write(msg)
+
+    print = print_with_bar
+    write = print_in_line
 
 
 def _progress_bar(function, estimated_time, tstep, progress_name, tqdm_kwargs={}, args=[], kwargs={}):
@@ -1646,44 +2180,27 @@ def _progress_bar(function, estimated_time, tstep, progress_name, tqdm_kwargs={}
     pbar = tqdm.tqdm(total=estimated_time,**tqdm_kwargs)
     pbar.set_description(progress_name)
 
-
-    def return_save(function, ret, *args, **kwargs):
-        ret[0] = function(*args, **kwargs)
-    
-    class _progress_bar_build_in_print():
-        @staticmethod
-        def print_with_bar(msg):
-            pbar.bar_format = tqdm_kwargs["bar_format"] + msg
-        @staticmethod
-        def print_in_line(msg):
-            pbar.write(msg)
-        print = print_with_bar
-        write = print_in_line
-
     if '_progress_bar' in kwargs.keys():
-        kwargs['_progress_bar'] = _progress_bar_build_in_print
+        # the base format is bound once, tqdm's own default when none was given
+        kwargs['_progress_bar'] = _BarPrinter(pbar, tqdm_kwargs.get("bar_format") or '{l_bar}{bar}{r_bar}')
 
-    thread = threading.Thread(target=return_save, args=(function, ret) + tuple(args), kwargs=kwargs)
+    done = threading.Event()
+    thread = threading.Thread(target=_return_save, args=(function, ret, done) + tuple(args), kwargs=kwargs)
     actuall_time = 0
     thread.start()
 
-    while thread.is_alive():
-        thread.join(timeout=tstep)
+    # wait() returns as soon as the function is done, no extra wake-ups after that
+    while not done.wait(tstep):
+        # for actual running time are longer than estimated_time, stop at 100%
         if actuall_time < estimated_time:
-            pbar.update(tstep)
-            actuall_time += tstep
-        # for actual running time are longer than estimated_time
-        if actuall_time + tstep > estimated_time:
-            tstep = estimated_time - actuall_time
-            pbar.update(tstep)
-            actuall_time += tstep
-    
-    # for actual function running time is shorter than estimated_time
-    while(actuall_time < estimated_time):
-        if actuall_time + tstep > estimated_time:
-            tstep = estimated_time - actuall_time
-        pbar.update(tstep)
-        actuall_time += tstep
+            step = min(tstep, estimated_time - actuall_time)
+            pbar.update(step)
+            actuall_time += step
+    thread.join()
+
+    # for actual function running time is shorter than estimated_time, fill it in one go
+    if actuall_time < estimated_time:
+        pbar.update(estimated_time - actuall_time)
 
     pbar.close()
     return ret[0]
@@ -1769,20 +2286,22 @@ def merge_dicts(dict1, dict2):
     # common
     ####################
 
-    for k in set(dict1) | set(dict2):
-    # for k in set(dict1.keys()).union(dict2.keys()):
-        if k in dict1 and k in dict2:
-            if isinstance(dict1[k], dict) and isinstance(dict2[k], dict):
-                yield (k, dict(merge_dicts(dict1[k], dict2[k])))
+    # walk dict1 then the keys only in dict2, no union set is built
+    for k, v1 in dict1.items():
+        if k in dict2:
+            v2 = dict2[k]
+            if isinstance(v1, dict) and isinstance(v2, dict):
+                yield (k, dict(merge_dicts(v1, v2)))
             else:
                 # If one of the values is not a dict, you can't continue merging it.
                 # Value from second dict overrides one in first and we move on.
-                yield (k, dict2[k])
+                yield (k, v2)
                 # Alternatively, replace this with exception raiser to alert you of value conflicts
-        elif k in dict1:
-            yield (k, dict1[k])
         else:
-            yield (k, dict2[k])
+            yield (k, v1)
+    for k, v2 in dict2.items():
+        if k not in dict1:
+            yield (k, v2)
 
 
 def merge_all_dicts(dict_container:list):
@@ -1794,22 +2313,13 @@ def merge_all_dicts(dict_container:list):
     >>> merge_all_dicts([dict1, dict2, ...])
     """
     ###### import ######
-    # common
+    reduce = _dmimport(from_module='functools', import_module='reduce')
     ####################
 
-    if len(dict_container) > 1:
-        for idx in range(len(dict_container)):
-            if idx == 0:
-                temp = dict(merge_dicts(dict_container[0], dict_container[1]))
-            elif idx == 1:
-                continue
-            else:
-                temp = dict(merge_dicts(temp, dict_container[idx]))
-        return temp
-    elif len(dict_container) == 1:
-        return dict_container[0]
-    else:
+    # a single dict is returned as it is, like before
+    if not dict_container:
         return {}
+    return reduce(lambda merged, d: dict(merge_dicts(merged, d)), dict_container)
 
 
 def print_aligned(string1, string2, align_width):
@@ -1822,7 +2332,7 @@ def print_aligned(string1, string2, align_width):
 
 
 def _test_connection(name, url, timeout=10):
-    """Simple connection test"""
+    """Simple connection test, return the result line"""
     ###### import ######
     socket = _dmimport(import_module="socket")
     time = _dmimport(import_module="time")
@@ -1835,42 +2345,48 @@ def _test_connection(name, url, timeout=10):
     urlinfo = urlparse(url)
     start = time.time()
     try:
-        ip = socket.gethostbyname(urlinfo.netloc)
+        socket.gethostbyname(urlinfo.hostname)
     except Exception as e:
-        print('Error resolving DNS for {}: {}, {}'.format(name, url, e))
-        return
+        return 'Error resolving DNS for {}: {}, {}'.format(name, url, e)
     dns_elapsed = time.time() - start
     start = time.time()
     try:
-        _ = urlopen(url, timeout=timeout)
+        with urlopen(url, timeout=timeout):
+            pass
     except Exception as e:
-        print("Error open {}: {}, {}, DNS finished in {} sec.".format(name, url, e, dns_elapsed))
-        return
+        return "Error open {}: {}, {}, DNS finished in {} sec.".format(name, url, e, dns_elapsed)
     load_elapsed = time.time() - start
-    print("Timing for {}: {}, DNS: {:.4f} sec, LOAD: {:.4f} sec.".format(name, url, dns_elapsed, load_elapsed))
+    return "Timing for {}: {}, DNS: {:.4f} sec, LOAD: {:.4f} sec.".format(name, url, dns_elapsed, load_elapsed)
 
 
 def _check_network(region="cn", timeout=10):
     ###### import ######
     socket = _dmimport(import_module="socket")
+    warnings = _dmimport(import_module="warnings")
+    ThreadPoolExecutor = _dmimport(from_module='concurrent.futures', import_module='ThreadPoolExecutor')
     ####################
 
-    GV = GlobalVars()
+    GV = _gv()
     print_aligned("[Network Test", "]", 15)
     if timeout > 0:
         print(f'Setting timeout: {timeout}')
-        socket.setdefaulttimeout(10)
+        socket.setdefaulttimeout(timeout)
+    # URLS is cached on the shared instance, add the regional sites to a copy
+    urls = dict(GV.URLS)
+    regional_urls = GV.REGIONAL_URLS
     for region in region.strip().split(','):
         r = region.strip().lower()
         if not r:
             continue
-        if r in GV.REGIONAL_URLS:
-            GV.URLS.update(GV.REGIONAL_URLS[r])
+        if r in regional_urls:
+            urls.update(regional_urls[r])
         else:
-            import warnings
             warnings.warn(f'Region {r} do not need specific test, please refer to global sites.')
-    for name, url in GV.URLS.items():
-        _test_connection(name, url, timeout)
+    # the probes only wait on the network, run them together and print in the original order
+    with ThreadPoolExecutor(max_workers=min(16, len(urls))) as executor:
+        results = executor.map(lambda item: _test_connection(*item, timeout), urls.items())
+        for result in results:
+            print(result)
 
 
 def _check_python():
@@ -1899,61 +2415,81 @@ def _check_pip():
         print('No corresponding pip install for current python.')
 
 
-def _check_pytorch():
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
+def _probe_pytorch():
+    """collect the pytorch report lines once, the CUDA probe is slow"""
     ###### import ######
     torch = _dmimport(import_module="torch")
     ####################
 
+    if not torch:
+        return ('No Pytorch installed.',)
+    lines = [str(torch), f'Version      : {torch.__version__}']
+    cudaenbale = torch.cuda.is_available()
+    device = torch.device("cuda" if cudaenbale else "cpu") 
+    if cudaenbale: 
+        lines.append(f'CUDA         : {torch.version.cuda}')
+        lines.append(f'CUDNN        : {torch.backends.cudnn.version()}')
+        lines.append(f'GPU          : {torch.cuda.get_device_name(device)}')
+    return tuple(lines)
+
+
+def _check_pytorch():
+    ###### import ######
+    # common
+    ####################
+
     print_aligned("[Pytorch", "]", 15)
-    if torch:
-        print(torch)
-        print('Version      :',torch.__version__)
-        cudaenbale = torch.cuda.is_available()
-        device = torch.device("cuda" if cudaenbale else "cpu") 
-        if cudaenbale: 
-            print('CUDA         :', torch.version.cuda)
-            print('CUDNN        :', torch.backends.cudnn.version())
-            print('GPU          :', torch.cuda.get_device_name(device))
-    else:
-        print('No Pytorch installed.')
+    print('\n'.join(_probe_pytorch()))
 
 
-def _check_mxnet():
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=1)
+def _probe_mxnet():
+    """collect the mxnet report lines once"""
     ###### import ######
     mxnet = _dmimport(import_module="mxnet")
     os    = _dmimport(import_module="os")
     ####################
 
+    if not mxnet:
+        return ('No MXNet installed.',)
+
+    def get_build_features_str():
+        features = mxnet.runtime.Features()
+        return '\n'.join(map(str, list(features.values())))
+    
+    lines = [f'Version      : {mxnet.__version__}']
+    mx_dir = os.path.dirname(mxnet.__file__)
+    lines.append(f'Directory    : {mx_dir}')
+    try:
+        branch = mxnet.runtime.get_branch()
+        commit_hash = mxnet.runtime.get_commit_hash()
+        lines.append(f'Branch       : {branch}')
+        lines.append(f'Commit Hash  : {commit_hash}')
+    except AttributeError:
+        commit_hash = os.path.join(mx_dir, 'COMMIT_HASH')
+        if os.path.exists(commit_hash):
+            with open(commit_hash, 'r') as f:
+                ch = f.read().strip()
+                lines.append(f'Commit Hash   : {ch}')
+        else:
+            lines.append('Commit hash file "{}" not found. Not installed from pre-built package or built from source.'.format(commit_hash))
+    lines.append(f'Library      : {mxnet.libinfo.find_lib_path()}')
+    lines.append('Build features:')
+    try:
+        lines.append(get_build_features_str())
+    except (AttributeError, ModuleNotFoundError):
+        lines.append('No runtime build feature info available')
+    return tuple(lines)
+
+
+def _check_mxnet():
+    ###### import ######
+    # common
+    ####################
+
     print_aligned("[Mxnet", "]", 15)
-    if mxnet:
-        def get_build_features_str():
-            features = mxnet.runtime.Features()
-            return '\n'.join(map(str, list(features.values())))
-        
-        print('Version      :', mxnet.__version__)
-        mx_dir = os.path.dirname(mxnet.__file__)
-        print('Directory    :', mx_dir)
-        try:
-            branch = mxnet.runtime.get_branch()
-            commit_hash = mxnet.runtime.get_commit_hash()
-            print('Branch       :', branch)
-            print('Commit Hash  :', commit_hash)
-        except AttributeError:
-            commit_hash = os.path.join(mx_dir, 'COMMIT_HASH')
-            if os.path.exists(commit_hash):
-                with open(commit_hash, 'r') as f:
-                    ch = f.read().strip()
-                    print('Commit Hash   :', ch)
-            else:
-                print('Commit hash file "{}" not found. Not installed from pre-built package or built from source.'.format(commit_hash))
-        print('Library      :', mxnet.libinfo.find_lib_path())
-        try:
-            print('Build features:')
-            print(get_build_features_str())
-        except (AttributeError, ModuleNotFoundError):
-            print('No runtime build feature info available')
-    else:
-        print('No MXNet installed.')
+    print('\n'.join(_probe_mxnet()))
 
 
 def _check_os():
@@ -1974,20 +2510,35 @@ def _check_os():
 
 def _check_hardware():
     ###### import ######
+    os = _dmimport(import_module="os")
     platform = _dmimport(import_module="platform")
-    subprocess = _dmimport(import_module="subprocess")
+    winreg = _dmimport(import_module="winreg")
     ####################
     
     print_aligned("[Hardware", "]", 15)
     print('machine      :', platform.machine())
     print('processor    :', platform.processor())
     
-    if GlobalVars().SYSTEM == "linux":
-        subprocess.call(['lscpu'])
-    elif GlobalVars().SYSTEM == "windows":
-        out, _ = sysc("wmic cpu get name")
-        cpu = out.split('\n')[2]
-        print('CPU          :', cpu)
+    # platform.system() is capitalized
+    system = _gv().SYSTEM
+    print('cores        :', os.cpu_count())
+    if system == "Linux":
+        # the first "model name" in /proc/cpuinfo, no lscpu process
+        cpu = ''
+        with open('/proc/cpuinfo', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu = line.partition(':')[2]
+                    break
+        print('CPU          :', cpu.strip() or platform.processor())
+    elif system == "Darwin":
+        # platform caches its uname result, no sysctl process and nothing that can fail here
+        print('CPU          :', platform.processor())
+    elif system == "Windows":
+        # read the name straight from the registry, no wmic process
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r'HARDWARE\DESCRIPTION\System\CentralProcessor\0') as key:
+            cpu, _ = winreg.QueryValueEx(key, 'ProcessorNameString')
+        print('CPU          :', cpu.strip())
 
 
 def _check_environment():
@@ -1996,9 +2547,11 @@ def _check_environment():
     ####################
 
     print_aligned("[Env", "]", 15)
-    for k,v in os.environ.items():
-        # if k.startswith('MXNET_') or k.startswith('OMP_') or k.startswith('KMP_') or k == 'CC' or k == 'CXX':
-            print('{}="{}"'.format(k,v))
+    # build the whole block and print it once instead of one print per variable
+    # if k.startswith('MXNET_') or k.startswith('OMP_') or k.startswith('KMP_') or k == 'CC' or k == 'CXX':
+    env = '\n'.join(f'{k}="{v}"' for k, v in os.environ.items())
+    if env:
+        print(env)
 
 
 def check_your_system():
@@ -2049,179 +2602,318 @@ def exception_print(e):
     print(repr(e))
 
 
-def read_treezip(treezip, factory_lst=[], product_lst=[], station_lst=[], type_lst=[]) -> list:
-    """ only support personal designed tree files, otherwise this function is useless"""
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=32)
+def _substring_matcher(keywords):
+    """
+    build a function telling if a string contains any of the keywords,
+    same as any(k in s for k in keywords) but the string is scanned only once:
+    an Aho-Corasick automaton if pyahocorasick is installed, otherwise one compiled regex
+
+    keywords has to be a tuple, the matchers are cached
+    """
     ###### import ######
-    zipfile = _dmimport(import_module="zipfile")
-    shutil  = _dmimport(import_module="shutil")
-    os      = _dmimport(import_module="os")
+    re          = _dmimport(import_module='re')
+    ahocorasick = _dmimport(import_module='ahocorasick')
     ####################
 
-    GV = GlobalVars()
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        return lambda text: False
+    if '' in keywords:
+        return lambda text: True
+    if len(keywords) == 1:
+        # a plain `in` beats any automaton for a single keyword
+        keyword = keywords[0]
+        return lambda text: keyword in text
+    if ahocorasick:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    search = re.compile('|'.join(map(re.escape, keywords))).search
+    return lambda text: search(text) is not None
+
+
+def _treezip_filter(lines, SEP, product_lst, station_lst, type_lst) -> list:
+    """filter the paths of one tree file, lines is any iterable of text lines"""
+    ###### import ######
+    # common
+    ####################
+
+    if not (product_lst or station_lst or type_lst):
+        return [line.strip() for line in lines]
+
     path_list = []
-    shutil.copyfile(treezip, fr"{GV.CURRENTWORKDIR}{GV.SEP}tmptree.zip")
-    print(f"copy file to {GV.CURRENTWORKDIR}{GV.SEP}tmptree.zip")
-    treezip = fr"{GV.CURRENTWORKDIR}{GV.SEP}tmptree.zip" 
-
-    if factory_lst and not product_lst and not station_lst:
-        scenario = "FACTORY_ONLY"
-    elif factory_lst and product_lst and not station_lst:
-        scenario = "FACTORY_plus_PRODUCT"
-    elif factory_lst and not product_lst and station_lst:
-        scenario = "FACTORY_plus_STATION"
-    elif factory_lst and product_lst and station_lst:
-        scenario = "FACTORY_plus_PRODUCT_plus_STATION"
-    elif not factory_lst and product_lst and not station_lst:
-        scenario = "PRODUCT_ONLY"
-    elif not factory_lst and product_lst and station_lst:
-        scenario = "PRODUCT_plus_STATION"
-    elif not factory_lst and not product_lst and station_lst:
-        scenario = "STATION_ONLY"
-    elif not factory_lst and not product_lst and not station_lst:
-        scenario = "ALL"
-
-    match scenario:
-        case "ALL":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    with z.open(tree_file, 'r') as file:
-                        abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                        if type_lst:
-                            for abs_path in abs_path_list:
-                                if any(log_type in abs_path for log_type in type_lst):
-                                    path_list.append(abs_path)
-                        else:
-                            path_list.extend(abs_path_list)
-        
-        case "FACTORY_ONLY":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    factory_in_tree = tree_file.split('_')[0]
-                    if factory_in_tree in factory_lst:
-                        with z.open(tree_file, 'r') as file:
-                            abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                        if type_lst:
-                            for abs_path in abs_path_list:
-                                if any(log_type in abs_path for log_type in type_lst):
-                                    path_list.append(abs_path)
-                        else:
-                            path_list.extend(abs_path_list)
-        
-        case "PRODUCT_ONLY":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    with z.open(tree_file, 'r') as file:
-                        abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                        for abs_path in abs_path_list:
-                            try:
-                                product_in_tree = abs_path.split(GV.SEP)[-1].split("_")[2]
-                            except Exception:
-                                continue
-                            if any(product in product_in_tree for product in product_lst):
-                                if type_lst:
-                                    if any(log_type in abs_path for log_type in type_lst):
-                                        path_list.append(abs_path)
-                                else:
-                                    path_list.append(abs_path)
-        
-        case "STATION_ONLY":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    with z.open(tree_file, 'r') as file:
-                        abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                        for abs_path in abs_path_list:
-                            try:
-                                station_in_tree = abs_path.split(GV.SEP)[-1].split("_")[5]
-                            except Exception:
-                                continue
-                            if any(station in station_in_tree for station in station_lst):
-                                if type_lst:
-                                    if any(log_type in abs_path for log_type in type_lst):
-                                        path_list.append(abs_path)
-                                else:
-                                    path_list.append(abs_path)
-        
-        case "FACTORY_plus_PRODUCT":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    factory_in_tree = tree_file.split('_')[0]
-                    if factory_in_tree in factory_lst:
-                        with z.open(tree_file, 'r') as file:
-                            abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                            for abs_path in abs_path_list:
-                                try:
-                                    product_in_tree = abs_path.split(GV.SEP)[-1].split("_")[2]
-                                except Exception:
-                                    continue
-                                if any(product in product_in_tree for product in product_lst):
-                                    if type_lst:
-                                        if any(log_type in abs_path for log_type in type_lst):
-                                            path_list.append(abs_path)
-                                    else:
-                                        path_list.append(abs_path)
-        
-        case "FACTORY_plus_STATION":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    factory_in_tree = tree_file.split('_')[0]
-                    if factory_in_tree in factory_lst:
-                        with z.open(tree_file, 'r') as file:
-                            abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                            for abs_path in abs_path_list:
-                                try:
-                                    station_in_tree = abs_path.split(GV.SEP)[-1].split("_")[5]
-                                except Exception:
-                                    continue
-                                if any(station in station_in_tree for station in station_lst):
-                                    if type_lst:
-                                        if any(log_type in abs_path for log_type in type_lst):
-                                            path_list.append(abs_path)
-                                    else:
-                                        path_list.append(abs_path)
-        
-        case "FACTORY_plus_PRODUCT_plus_STATION":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    factory_in_tree = tree_file.split('_')[0]
-                    if factory_in_tree in factory_lst:
-                        with z.open(tree_file, 'r') as file:
-                            abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                            for abs_path in abs_path_list:
-                                try:
-                                    product_in_tree = abs_path.split(GV.SEP)[-1].split("_")[2]
-                                    station_in_tree = abs_path.split(GV.SEP)[-1].split("_")[5]
-                                except Exception:
-                                    continue
-                                if any(station in station_in_tree for station in station_lst) and any(product in product_in_tree for product in product_lst):
-                                    if type_lst:
-                                        if any(log_type in abs_path for log_type in type_lst):
-                                            path_list.append(abs_path)
-                                    else:
-                                        path_list.append(abs_path)
-        
-        case "PRODUCT_plus_STATION":
-            with zipfile.ZipFile(treezip, "r") as z:
-                for tree_file in reversed(z.namelist()):
-                    with z.open(tree_file, 'r') as file:
-                        abs_path_list = list(map(lambda x: x.decode().strip(), file.readlines()))
-                        for abs_path in abs_path_list:
-                            try:
-                                product_in_tree = abs_path.split(GV.SEP)[-1].split("_")[2]
-                                station_in_tree = abs_path.split(GV.SEP)[-1].split("_")[5]
-                            except Exception:
-                                continue
-                            if any(station in station_in_tree for station in station_lst) and any(product in product_in_tree for product in product_lst):
-                                if type_lst:
-                                    if any(log_type in abs_path for log_type in type_lst):
-                                        path_list.append(abs_path)
-                                else:
-                                    path_list.append(abs_path)
-    os.remove(treezip)
+    # one scan per string instead of one `in` per keyword
+    type_match    = _substring_matcher(tuple(type_lst))
+    product_match = _substring_matcher(tuple(product_lst))
+    station_match = _substring_matcher(tuple(station_lst))
+    # the checks that are off are decided here once, not per line
+    if not (product_lst or station_lst):
+        return [abs_path for abs_path in map(str.strip, lines) if type_match(abs_path)]
+
+    # basename fields are name_x_PRODUCT_x_x_STATION_..., only split when a field is filtered
+    min_fields = 6 if station_lst else 3
+    for line in lines:
+        abs_path = line.strip()
+        fields = abs_path[abs_path.rfind(SEP) + 1:].split('_', 6)
+        if len(fields) < min_fields:
+            continue
+        if product_lst and not product_match(fields[2]):
+            continue
+        if station_lst and not station_match(fields[5]):
+            continue
+        if type_lst and not type_match(abs_path):
+            continue
+        path_list.append(abs_path)
+    return path_list
+
+
+@_dmimport(from_module='functools', import_module='lru_cache')(maxsize=32)
+def _line_prefilter(keywords):
+    """
+    build a function returning the lines of a whole text that contain any of the keywords,
+    the text is scanned by one compiled regex instead of testing every line in python
+
+    None when a keyword is empty or has whitespace, those have to be tested on the stripped lines
+    keywords has to be a tuple, the prefilters are cached
+    """
+    ###### import ######
+    re = _dmimport(import_module='re')
+    ####################
+
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords or any(not keyword or any(c.isspace() for c in keyword) for keyword in keywords):
+        return None
+    search = re.compile('|'.join(map(re.escape, keywords))).search
+
+    def prefilter(text):
+        lines = []
+        pos = 0
+        while match := search(text, pos):
+            start = text.rfind('\n', 0, match.start()) + 1
+            end = text.find('\n', match.end())
+            if end < 0:
+                end = len(text)
+            lines.append(text[start:end])
+            # one hit is enough for a line, go on from the next one
+            pos = end + 1
+        return lines
+    return prefilter
+
+
+def _treezip_worker(data, SEP, product_lst, station_lst, type_lst) -> list:
+    """process pool task of read_treezip, filter one decompressed tree file"""
+    ###### import ######
+    StringIO = _dmimport(from_module='io', import_module='StringIO')
+    ####################
+
+    text = data.decode('utf-8')
+    # every kept path contains one of the type (or product, or station) keywords,
+    # so the other lines are dropped by one regex scan and only the hits are filtered exactly
+    prefilter = _line_prefilter(tuple(type_lst or product_lst or station_lst))
+    if not prefilter:
+        return _treezip_filter(StringIO(text, newline='\n'), SEP, product_lst, station_lst, type_lst)
+    if not (product_lst or station_lst):
+        # the regex hits are exactly the type matches, nothing left to check
+        return [line.strip() for line in prefilter(text)]
+    return _treezip_filter(prefilter(text), SEP, product_lst, station_lst, type_lst)
+
+
+def _treezip_pool(z, tree_files, filters, workers):
+    """
+    filter the tree files of read_treezip in a process pool, yield (factory, paths) in file order
+
+    the zip is read here, the workers only decode and filter, at most 2 * workers
+    decompressed tree files are in flight at once so big zips do not pile up in memory
+    """
+    ###### import ######
+    deque               = _dmimport(from_module='collections', import_module='deque')
+    ProcessPoolExecutor = _dmimport(from_module='concurrent.futures', import_module='ProcessPoolExecutor')
+    ####################
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for factory, info in tree_files:
+            pending.append((factory, executor.submit(_treezip_worker, z.read(info), *filters)))
+            if len(pending) >= 2 * workers:
+                factory, future = pending.popleft()
+                yield factory, future.result()
+        while pending:
+            factory, future = pending.popleft()
+            yield factory, future.result()
+
+
+# read_treezip(records=True) result, factory comes from the tree file name, product/station from the path
+PathRecord = _dmimport(from_module='collections', import_module='namedtuple')('PathRecord', 'factory product station abs_path')
+
+
+class PathBlob:
+    """
+    read-only list of paths kept in one utf-8 buffer, read_treezip(compact=True) result
+
+    the paths are concatenated into a bytearray with an offsets array for the boundaries,
+    a str is only built when an item is read, much smaller than a list of str for big trees
+    """
+    __slots__ = ('_blob', '_offsets')
+
+    def __init__(self, paths=()):
+        ###### import ######
+        array = _dmimport(from_module='array', import_module='array')
+        ####################
+        self._blob = bytearray()
+        self._offsets = array('Q', [0])
+        self.extend(paths)
+
+    def append(self, path):
+        self._blob += path.encode('utf-8')
+        self._offsets.append(len(self._blob))
+
+    def extend(self, paths):
+        blob, offsets = self._blob, self._offsets
+        for path in paths:
+            blob += path.encode('utf-8')
+            offsets.append(len(blob))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('PathBlob index out of range')
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def __iter__(self):
+        blob, offsets = self._blob, self._offsets
+        for i in range(len(offsets) - 1):
+            yield blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def __repr__(self):
+        return f'PathBlob({len(self)} paths, {len(self._blob)} bytes)'
+
+
+def _treezip_records(paths, factory, SEP) -> list:
+    """wrap the kept paths of one tree file into PathRecord"""
+    ###### import ######
+    # common
+    ####################
+
+    records = []
+    for abs_path in paths:
+        fields = abs_path[abs_path.rfind(SEP) + 1:].split('_', 6)
+        records.append(PathRecord(factory,
+                                  fields[2] if len(fields) > 2 else '',
+                                  fields[5] if len(fields) > 5 else '',
+                                  abs_path))
+    return records
+
+
+def read_treezip(treezip, factory_lst=[], product_lst=[], station_lst=[], type_lst=[], workers=None, records=False, compact=False) -> 'list | PathBlob':
+    """
+    only support personal designed tree files, otherwise this function is useless
+
+    treezip: str/file object/bytes, the tree zip, zip content in memory is read without touching the disk
+    workers: int, filter the tree files in that many processes, None to do it in this process
+             (on Windows/macOS the caller has to be under `if __name__ == "__main__":`)
+    records: bool, return PathRecord(factory, product, station, abs_path) instead of path strings,
+             so callers do not parse the paths again ('' for a field the name does not have)
+    compact: bool, return the path strings as a PathBlob (one buffer instead of one str per path),
+             for very big trees, ignored when records is True
+    """
+    ###### import ######
+    zipfile = _dmimport(import_module="zipfile")
+    BytesIO = _dmimport(from_module='io', import_module='BytesIO')
+    ####################
+
+    if isinstance(treezip, (bytes, bytearray, memoryview)):
+        treezip = BytesIO(treezip)
+    SEP = _gv().SEP
+    path_list = PathBlob() if compact and not records else []
+    factory_set = frozenset(factory_lst)
+    filters = (SEP, tuple(product_lst), tuple(station_lst), tuple(type_lst))
+
+    with zipfile.ZipFile(treezip, "r") as z:
+        # reversed() on the cached infolist is only an iterator, the selection is lazy too
+        tree_files = ((info.filename.partition('_')[0], info) for info in reversed(z.infolist()))
+        if factory_set:
+            tree_files = ((factory, info) for factory, info in tree_files if factory in factory_set)
+        if workers:
+            filtered = _treezip_pool(z, tree_files, filters, workers)
+        else:
+            # one read and one decode per tree file, the line splitting runs in C
+            filtered = ((factory, _treezip_worker(z.read(info), *filters)) for factory, info in tree_files)
+        for factory, paths in filtered:
+            path_list.extend(_treezip_records(paths, factory, SEP) if records else paths)
     print("Parsing Tree File Successfullly!")
     return path_list
 
 
+def _pgo_training(files=2000, rounds=20):
+    """
+    PGO training workload, run by `python dmutils.py --self-pgo`
+
+    exercise the real hot paths of this module (file walking, subprocess output, Tee, tree filtering)
+    so Nuitka can collect a profile, build the dmutils program (not an importable module) with:
+
+    python -m nuitka --pgo --lto=auto --pgo-args="--self-pgo" dmutils.py
+    """
+    ###### import ######
+    tempfile        = _dmimport(import_module='tempfile')
+    shutil          = _dmimport(import_module='shutil')
+    io              = _dmimport(import_module='io')
+    os              = _dmimport(import_module='os')
+    zipfile         = _dmimport(import_module='zipfile')
+    redirect_stdout = _dmimport(from_module='contextlib', import_module='redirect_stdout')
+    ####################
+
+    root = tempfile.mkdtemp(prefix='dmutils_pgo_')
+    # tree file lines shaped like the real ones, dir/name_x_PRODUCT_x_x_STATION_n.ext
+    tree_lines = [f'{root}{os.sep}F{i % 3}{os.sep}sn_x_P{i % 7}00_x_x_ST{i % 5}_{i}.{("log", "csv")[i % 2]}\n' for i in range(files)]
+    # selective and dense filters, so both the regex prefilter and the per line filter get trained
+    tree_filters = (((), (), ()), ((), (), ('.log',)), ((), (), ('_7.', '_77.')), (('P1', 'P2'), (), ()),
+                    (('P1',), ('ST1', 'ST2'), ('.log', '.csv')), ((), (), (' ',)))
+    # an in memory tree zip, read_treezip runs the same path as on a real one
+    treezip = io.BytesIO()
+    with zipfile.ZipFile(treezip, 'w', zipfile.ZIP_DEFLATED) as z:
+        for factory in range(3):
+            z.writestr(f'F{factory}_tree.txt', ''.join(tree_lines[factory::3]))
+    treezip = treezip.getvalue()
+    try:
+        for i in range(files):
+            folder = os.path.join(root, str(i % 10), str(i % 100))
+            mkdir(folder)
+            with open(os.path.join(folder, f'{i}.log'), 'w') as f:
+                f.write('x\n')
+        with open(os.path.join(root, 'tee.log'), 'w') as f:
+            tee = Tee(io.StringIO(), f)
+            for _ in range(rounds):
+                get_all_path(root)
+                level_x_path(root, level=2)
+                for _ in get_path(root):
+                    pass
+                sysc("echo x", outprint=False)
+                with redirect_stdout(io.StringIO()):
+                    for product_lst, station_lst, type_lst in tree_filters:
+                        read_treezip(treezip, [], product_lst, station_lst, type_lst)
+                    read_treezip(treezip, ['F1'], ('P1',), (), (), records=True)
+                for line in range(100):
+                    tee.write(f'line {line}\n')
+                tee.flush()
+            tee.flush_all()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
 if __name__ == "__main__":
+    import sys
+    if '--self-pgo' in sys.argv:
+        _pgo_training()
+        sys.exit(0)
     LOG = dmlog(branch="dmutils")
     GV = GlobalVars()
     LOG.info(f"date         : {GV.CURRENTDATE}")